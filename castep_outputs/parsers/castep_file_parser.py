@@ -6,7 +6,6 @@ Port of extract_results.pl
 """
 from __future__ import annotations
 
-import io
 import itertools
 import re
 from collections import defaultdict
@@ -15,7 +14,7 @@ from typing import Any, Dict, List, TextIO, Union, cast
 
 from ..utilities import castep_res as REs
 from ..utilities.castep_res import gen_table_re, get_numbers, labelled_floats
-from ..utilities.constants import SHELLS
+from ..utilities.constants import MINIMISERS, SHELLS
 from ..utilities.datatypes import (
     AtomIndex,
     AtomPropBlock,
@@ -50,7 +49,7 @@ from ..utilities.datatypes import (
     ThreeVector,
     WvfnLineMin,
 )
-from ..utilities.filewrapper import Block, FileWrapper
+from ..utilities.filewrapper import Block, FileWrapper, LazyBlock
 from ..utilities.utility import (
     add_aliases,
     atreg_to_index,
@@ -77,6 +76,128 @@ from .parse_fmt_files import (
 from .phonon_dos_file_parser import parse_phonon_dos_file
 from .xrd_sf_file_parser import parse_xrd_sf_file
 
+# Patterns used against every line of the file, compiled once rather
+# than on each pass through the main loop.
+_RUN_STARTED_RE = re.compile(r"Run started")
+_WARNING_RE = re.compile(r"(?:\s*[^:]+:)?(\s*)warning", re.IGNORECASE)
+_TITLE_RE = re.compile(gen_table_re("Title", r"\*+"))
+_PSPOT_EIGENVALUE_RE = re.compile(r"\s*(?P<type>AE|PS) eigenvalue nl (?P<nl>\d+) =" +
+                                  labelled_floats(("eigenvalue",)))
+_BSC_CUTOFF_RE = re.compile(r" with +(\d) +cut-off energies.")
+_FINAL_FREE_ENERGY_RE = re.compile(rf"Final free energy \(E-TS\) += +({REs.EXPFNUMBER_RE})")
+_DEDLNE_RE = re.compile(rf"finite basis dEtot\/dlog\(Ecut\) = +({REs.FNUMBER_RE})")
+_MINIMISER_ENTHALPY_RE = re.compile(f"(?P<minim>{REs.MINIMISERS_RE}):"
+                                    r" finished iteration\s*\d+\s*with enthalpy")
+_TRIAL_GUESS_RE = re.compile(rf"trial guess \(lambda=\s*({REs.EXPFNUMBER_RE})\)")
+_MINIMISER_FINAL_RE = re.compile(rf"^\s*(?:{REs.MINIMISERS_RE}):\s*"
+                                 r"(?P<key>Final [^=]+)=\s*"
+                                 f"(?P<value>{REs.EXPFNUMBER_RE}).*",
+                                 re.IGNORECASE)
+_MINIMISERS_RE = re.compile(REs.MINIMISERS_RE)
+_ELASTIC_CONTRIBUTION_RE = re.compile("(?P<type>.* Contribution)")
+
+# Every branch of the main parse loop requires one of these
+# (case-insensitive) tokens to be present in the line.  Lines containing
+# none of them cannot match any branch, so the whole chain can be skipped
+# after a single scan.  A new branch in the loop must have its trigger
+# token added here.
+_LOOP_TRIGGERS = (
+    # System info
+    "Compiled for", "Run started", "Initialisation time", "Overall parallel",
+    "Reading continuation", "?", "warning", "MEMORY AND SCRATCH",
+    # Parameters
+    "Title", "Parameters", "Quantisation axis", "PairParams", "DFT-D",
+    "k-Points For BZ Sampling", "Applied Electric Field",
+    "External pressure/stress", "Initial magnetic",
+    # Species properties
+    "Pseudo atomic calculation", "Mass of species", "Electric Quadrupole Moment",
+    "pseudopotentials", "Pseudopotential Report", "eigenvalue nl",
+    # SCF and energies
+    "SCF loop", "WAVEFUNCTION LINE MINIMISATION", "Occupancy",
+    "cut-off energies", "Final energy", "Total energy corrected",
+    "0K energy", "(SEDC)", "Dispersion corrected", "Final free energy",
+    "Free energy of solvation", "Integrated", "finite basis dEtot",
+    # Cell and positions
+    "Unit Cell", "Symmetry and Constraints", "Reactant", "Product",
+    "Fractional coordinates", "Supercell generated",
+    "User Supplied Ionic Velocities",
+    # Forces, stresses and phonons
+    "Forces", "Stress Tensor", "Vibrational Frequencies",
+    "Phonon Symmetry Analysis", "Dynamical matrix", "Raman Susceptibility",
+    # Properties
+    "AUTOSOLVATION", "Optical Permittivity", "Polarisabilit",
+    "Nonlinear Optical Susceptibility", "Atomic Displacement Parameters",
+    "Thermodynamics", "Atomic Populations", "Born Effective Charges",
+    "Orbital Populations", "Bond", "Hirshfeld Analysis", "ELF grid sample",
+    "TDDFT", "B A N D", "Band Structure", "D I P O L E",
+    "Chemical Shielding", "Electric Field Gradient", "J-coupling",
+    "Hyperfine Tensor", "Elastic Constants Tensor", "Compliance Matrix",
+    "Contribution", "Elastic Properties",
+    # MD and geometry optimisation
+    "Starting", "MD Data:", "Final Configuration", "finished iteration",
+    "trial guess", "<--", *(f"{minim.upper()}:" for minim in MINIMISERS),
+    # Auxiliary file blocks
+    "BEGIN",
+)
+_LOOP_TRIGGER_RE = re.compile("|".join(map(re.escape, _LOOP_TRIGGERS)), re.IGNORECASE)
+
+# Patterns for lines within frequently-visited blocks.
+_PARAM_GROUP_RE = re.compile(r"\s*\*+ ([A-Za-z -]+) \*+")
+_PARAM_UNIT_RE = re.compile(r"\s*output (?P<key>.*) unit\s*:\s*(?P<val>.*)")
+_HIRSHFELD_RE = re.compile(rf"\s+{REs.ATREG}\s+(?P<charge>{REs.FNUMBER_RE})")
+_ELF_RE = re.compile(rf"\s+ELF\s+\d+\s+({REs.FNUMBER_RE})")
+_SPEC_PROP_RE = re.compile(rf"{REs.SPECIES_RE}\b")
+_MD_DATA_RE = re.compile(r"x\s+"
+                         r"(?P<key>[a-zA-Z][A-Za-z ]+):\s*"
+                         rf"(?P<val>{REs.FNUMBER_RE})")
+_SCF_EIGENVALUE_INIT_RE = re.compile(r"eigenvalue\s*\d+\s*init=")
+_SCF_ENERGY_RE = re.compile(r"[+(]?(?P<key>[()0-9A-Za-z -]+)="
+                            rf"\s*{labelled_floats(('val',))} eV\)?")
+_INITIAL_SPIN_RE = re.compile(rf"\s*\|\s*{REs.ATREG}\s*"
+                              rf"{labelled_floats(('spin', 'magmom'))}\s*"
+                              r"(?P<fix>[TF])\s*\|")
+_RAMAN_MODE_END_RE = re.compile(r"^ \+\s+\+")
+_BS_DATA_RE = re.compile(labelled_floats(("band", "energy"), sep=r"\s+"))
+_MEMORY_EST_RE = re.compile(r"\s*\|([A-Za-z ]+)" +
+                            labelled_floats(("memory", "disk"), suffix=" MB"))
+_KP_BLOCK_RE = re.compile(gen_table_re(r"\d\s*" + labelled_floats(("qx", "qy", "qz", "wt")),
+                                       r"\+"))
+_SYM_ROTATION_RE = re.compile(r"\s*\d+\s*rotation\s*")
+_PSPOT_ELEMENT_RE = re.compile(rf"Element: (?P<element>{REs.SPECIES_RE})\s+"
+                               rf"Ionic charge: (?P<ionic_charge>{REs.FNUMBER_RE})\s+"
+                               r"Level of theory: (?P<level_of_theory>[\w\d]+)")
+_PSPOT_SOLVER_RE = re.compile(r"Atomic Solver:\s*(?P<solver>[\w\s-]+)")
+_POPN_TOTAL_RE = re.compile(rf"\s*Total:\s*{labelled_floats(('charge',))}")
+_DFTD_SPECIES_RE = re.compile(rf"\s*x\s*(?P<spec>{REs.ATOM_NAME_RE})\s*" +
+                              labelled_floats(("C6", "R0")))
+_CHAR_TABLE_END_RE = re.compile("[-=]{4,}")
+_DIPOLE_TOTAL_RE = re.compile(r"Total\s*(?P<type>\w+)")
+_MINIMISER_KEY_VAL_RE = re.compile(rf"^\s*(?:{REs.MINIMISERS_RE}):"
+                                   r"(?P<key>[^=]+)=\s*"
+                                   f"(?P<value>{REs.EXPFNUMBER_RE}).*",
+                                   re.IGNORECASE)
+
+# Type schemas applied per matched line/entry, built once rather than
+# re-allocated on every call to fix_data_types.
+_MULLIKEN_SCHEMA = {**{orb: float for orb in (*SHELLS, "total", "charge", "spin")},
+                    **{f"up_{orb}": float for orb in (*SHELLS, "total")},
+                    **{f"dn_{orb}": float for orb in (*SHELLS, "total")}}
+_MULL_UP_ALIASES = {orb: f"up_{orb}" for orb in (*SHELLS, "total")}
+_MULL_DN_ALIASES = {orb: f"dn_{orb}" for orb in (*SHELLS, "total")}
+_BS_SCHEMA = {"spin": int,
+              "kx": float,
+              "ky": float,
+              "kz": float,
+              "kpgrp": int,
+              "band": int,
+              "energy": float}
+# Phonon mode properties typed at capture; remaining columns
+# (irrep, active, raman_active) stay as strings.
+_QDATA_TYPES = {"N": int,
+                "frequency": float,
+                "intensity": float,
+                "raman_intensity": float}
+
 
 class Filters(Flag):
     """
@@ -153,6 +274,11 @@ def parse_castep_file(castep_file_in: TextIO,
     logger = log_factory(castep_file)
 
     for line in castep_file:
+        # Most lines (SCF iterations, table data, etc.) cannot start a
+        # block; skip the whole dispatch chain for them with one scan.
+        if not _LOOP_TRIGGER_RE.search(line):
+            continue
+
         # Build Info
         if block := Block.from_re(line, castep_file,
                                   r"^\s*Compiled for",
@@ -169,7 +295,7 @@ def parse_castep_file(castep_file_in: TextIO,
             logger("Found build info")
             curr_run["build_info"] = _process_buildinfo(block)
 
-        elif re.search(r"Run started", line):
+        elif _RUN_STARTED_RE.search(line):
 
             if Filters.SYS_INFO not in to_parse:
                 continue
@@ -217,7 +343,7 @@ def parse_castep_file(castep_file_in: TextIO,
             block.remove_bounds(1, 1)
             curr_run["warning"].append(" ".join(x.strip() for x in block))
 
-        elif match := re.match(r"(?:\s*[^:]+:)?(\s*)warning", line, re.IGNORECASE):
+        elif match := _WARNING_RE.match(line):
 
             if Filters.SYS_INFO not in to_parse:
                 continue
@@ -248,7 +374,7 @@ def parse_castep_file(castep_file_in: TextIO,
             curr_run["memory_estimate"].append(_process_memory_est(block))
 
         # Title
-        elif re.match(gen_table_re("Title", r"\*+"), line):
+        elif _TITLE_RE.match(line):
 
             if Filters.PARAMETERS not in to_parse:
                 continue
@@ -352,8 +478,7 @@ def parse_castep_file(castep_file_in: TextIO,
 
             curr_run["pspot_detail"].append(_process_pspot_report(block))
 
-        elif match := re.match(r"\s*(?P<type>AE|PS) eigenvalue nl (?P<nl>\d+) =" +
-                               labelled_floats(("eigenvalue",)), line):
+        elif match := _PSPOT_EIGENVALUE_RE.match(line):
 
             if Filters.PSPOT not in to_parse:
                 continue
@@ -426,7 +551,7 @@ def parse_castep_file(castep_file_in: TextIO,
             curr_run["occupancies"].append(_process_occupancies(block))
 
         # SCF Basis set
-        elif match := re.search(r" with +(\d) +cut-off energies.", line):
+        elif match := _BSC_CUTOFF_RE.search(line):
 
             if Filters.SCF not in to_parse:
                 continue
@@ -495,7 +620,7 @@ def parse_castep_file(castep_file_in: TextIO,
                 to_type(get_numbers(line)[-1], float))
 
         # Free energies
-        elif re.match(rf"Final free energy \(E-TS\) += +({REs.EXPFNUMBER_RE})", line):
+        elif _FINAL_FREE_ENERGY_RE.match(line):
 
             logger("Found free energy (E-TS)")
 
@@ -593,7 +718,8 @@ def parse_castep_file(castep_file_in: TextIO,
                     else:
                         curr_run["labels"][ind] = "NULL"
 
-                    curr_run["initial_positions"][ind] = to_type(match.group("x", "y", "z"), float)
+                    curr_run["initial_positions"][ind] = tuple(map(float,
+                                                                   match.group("x", "y", "z")))
 
         elif block := Block.from_re(line, castep_file,  # Mixture
                                     r"Mixture\s+Fractional coordinates of atoms",
@@ -609,7 +735,7 @@ def parse_castep_file(castep_file_in: TextIO,
                 if match := REs.MIXTURE_LINE_1_RE.search(line):
                     val = match.groupdict()
                     spec, idx = atreg_to_index(match)
-                    pos = to_type(match.group("x", "y", "z"), float)
+                    pos = tuple(map(float, match.group("x", "y", "z")))
                     weight = float(match["weight"])
 
                     curr_run["initial_positions"][(spec, idx)] = {"pos": pos, "weight": weight}
@@ -675,7 +801,7 @@ def parse_castep_file(castep_file_in: TextIO,
             curr_run["target_stress"].append(accum)
 
         # Finite basis correction parameter
-        elif match := re.search(rf"finite basis dEtot\/dlog\(Ecut\) = +({REs.FNUMBER_RE})", line):
+        elif match := _DEDLNE_RE.search(line):
 
             logger("Found dE/dlog(E)")
             curr_run["dedlne"] = to_type(match.group(1), float)
@@ -1011,8 +1137,7 @@ def parse_castep_file(castep_file_in: TextIO,
                         replace=True)
             curr_run["geom_opt"]["iterations"].append(data)
 
-        elif match := re.search(f"(?P<minim>{REs.MINIMISERS_RE}):"
-                                r" finished iteration\s*\d+\s*with enthalpy", line):
+        elif match := _MINIMISER_ENTHALPY_RE.search(line):
 
             if Filters.GEOM_OPT not in to_parse:
                 continue
@@ -1023,17 +1148,14 @@ def parse_castep_file(castep_file_in: TextIO,
 
             curr_run["enthalpy"].append(to_type(get_numbers(line)[-1], float))
 
-        elif match := re.search(rf"trial guess \(lambda=\s*({REs.EXPFNUMBER_RE})\)", line):
+        elif match := _TRIAL_GUESS_RE.search(line):
 
             if "geom_opt" not in curr_run:
                 curr_run["geom_opt"] = defaultdict(list)
 
             curr_run["geom_opt"]["trial"].append(float(match.group(1)))
 
-        elif match := re.match(rf"^\s*(?:{REs.MINIMISERS_RE}):\s*"
-                               r"(?P<key>Final [^=]+)=\s*"
-                               f"(?P<value>{REs.EXPFNUMBER_RE}).*",
-                               line, re.IGNORECASE):
+        elif match := _MINIMISER_FINAL_RE.match(line):
 
             if Filters.GEOM_OPT not in to_parse:
                 continue
@@ -1050,7 +1172,7 @@ def parse_castep_file(castep_file_in: TextIO,
             if Filters.GEOM_OPT not in to_parse:
                 continue
 
-            if not (match := re.search(REs.MINIMISERS_RE, line)):
+            if not (match := _MINIMISERS_RE.search(line)):
                 raise ValueError("Invalid Geom block")
 
             typ = match.group(0)
@@ -1193,7 +1315,7 @@ def parse_castep_file(castep_file_in: TextIO,
 
         elif block := Block.from_re(line, castep_file, "Contribution ::", REs.EMPTY):
 
-            if not (match := re.match("(?P<type>.* Contribution)", line)):
+            if not (match := _ELASTIC_CONTRIBUTION_RE.match(line)):
                 raise ValueError("Invalid elastic block")
 
             typ = match.group("type")
@@ -1227,9 +1349,10 @@ def parse_castep_file(castep_file_in: TextIO,
         # --- Extra blocks for testing
 
         # Hugoniot data
-        elif block := Block.from_re(line, castep_file, "BEGIN hug", "END hug"):
+        elif block := LazyBlock.from_re(line, castep_file, "BEGIN hug", "END hug"):
 
             if Filters.TEST_EXTRA_DATA not in to_parse:
+                block.drain()
                 continue
 
             logger("Found hug block")
@@ -1238,9 +1361,10 @@ def parse_castep_file(castep_file_in: TextIO,
             curr_run["hug"].append(val)
 
         # Bands block (spectral data)
-        elif block := Block.from_re(line, castep_file, "BEGIN bands", "END bands"):
+        elif block := LazyBlock.from_re(line, castep_file, "BEGIN bands", "END bands"):
 
             if Filters.TEST_EXTRA_DATA not in to_parse:
+                block.drain()
                 continue
 
             logger("Found bands block")
@@ -1248,9 +1372,10 @@ def parse_castep_file(castep_file_in: TextIO,
             val = parse_bands_file(block)
             curr_run["bands"].append(val["bands"])
 
-        elif block := Block.from_re(line, castep_file, "BEGIN phonon_dos", "END phonon_dos"):
+        elif block := LazyBlock.from_re(line, castep_file, "BEGIN phonon_dos", "END phonon_dos"):
 
             if Filters.TEST_EXTRA_DATA not in to_parse:
+                block.drain()
                 continue
 
             logger("Found phonon_dos block")
@@ -1260,9 +1385,10 @@ def parse_castep_file(castep_file_in: TextIO,
             curr_run["gradients"] = val["gradients"]
 
         # E-Field
-        elif block := Block.from_re(line, castep_file, "BEGIN efield", "END efield"):
+        elif block := LazyBlock.from_re(line, castep_file, "BEGIN efield", "END efield"):
 
             if Filters.TEST_EXTRA_DATA not in to_parse:
+                block.drain()
                 continue
 
             logger("Found efield block")
@@ -1272,9 +1398,10 @@ def parse_castep_file(castep_file_in: TextIO,
             curr_run["permittivity"] = val["permittivity"]
 
         # Elastic
-        elif block := Block.from_re(line, castep_file, "<BEGIN elastic>", "<END elastic>"):
+        elif block := LazyBlock.from_re(line, castep_file, "<BEGIN elastic>", "<END elastic>"):
 
             if Filters.TEST_EXTRA_DATA not in to_parse:
+                block.drain()
                 continue
 
             logger("Found elastic block")
@@ -1284,29 +1411,29 @@ def parse_castep_file(castep_file_in: TextIO,
             curr_run["permittivity"] = val["compliance_matrix"]
 
         # XRD Structure Factor
-        elif block := Block.from_re(line, castep_file, "BEGIN xrd_sf", "END xrd_sf"):
+        elif block := LazyBlock.from_re(line, castep_file, "BEGIN xrd_sf", "END xrd_sf"):
 
             if Filters.TEST_EXTRA_DATA not in to_parse:
+                block.drain()
                 continue
 
             logger("Found xrdsf")
 
-            block = "\n".join(block[1:-1])  # Strip begin/end tags lazily
-            block = io.StringIO(block)
+            next(block)  # Skip begin tag; end tag is not yielded
             val = parse_xrd_sf_file(block)
 
             curr_run["xrd_sf"] = val
 
         # ELF FMT
-        elif block := Block.from_re(line, castep_file, "BEGIN elf_fmt", "END elf_fmt"):
+        elif block := LazyBlock.from_re(line, castep_file, "BEGIN elf_fmt", "END elf_fmt"):
 
             if Filters.TEST_EXTRA_DATA not in to_parse:
+                block.drain()
                 continue
 
             logger("Found ELF fmt")
 
-            block = "\n".join(block[1:-1])  # Strip begin/end tags lazily
-            block = io.StringIO(block)
+            next(block)  # Skip begin tag; end tag is not yielded
             val = parse_elf_fmt_file(block)
             if "kpt-data" not in curr_run:
                 curr_run["kpt-data"] = val
@@ -1314,15 +1441,15 @@ def parse_castep_file(castep_file_in: TextIO,
                 curr_run["kpt-data"].update(val)
 
         # CHDIFF FMT
-        elif block := Block.from_re(line, castep_file, "BEGIN chdiff_fmt", "END chdiff_fmt"):
+        elif block := LazyBlock.from_re(line, castep_file, "BEGIN chdiff_fmt", "END chdiff_fmt"):
 
             if Filters.TEST_EXTRA_DATA not in to_parse:
+                block.drain()
                 continue
 
             logger("Found CHDIFF fmt")
 
-            block = "\n".join(block[1:-1])  # Strip begin/end tags lazily
-            block = io.StringIO(block)
+            next(block)  # Skip begin tag; end tag is not yielded
             val = parse_chdiff_fmt_file(block)
             if "kpt-data" not in curr_run:
                 curr_run["kpt-data"] = val
@@ -1330,15 +1457,15 @@ def parse_castep_file(castep_file_in: TextIO,
                 curr_run["kpt-data"].update(val)
 
         # POT FMT
-        elif block := Block.from_re(line, castep_file, "BEGIN pot_fmt", "END pot_fmt"):
+        elif block := LazyBlock.from_re(line, castep_file, "BEGIN pot_fmt", "END pot_fmt"):
 
             if Filters.TEST_EXTRA_DATA not in to_parse:
+                block.drain()
                 continue
 
             logger("Found POT fmt")
 
-            block = "\n".join(block[1:-1])  # Strip begin/end tags lazily
-            block = io.StringIO(block)
+            next(block)  # Skip begin tag; end tag is not yielded
             val = parse_pot_fmt_file(block)
             if "kpt-data" not in curr_run:
                 curr_run["kpt-data"] = val
@@ -1346,15 +1473,15 @@ def parse_castep_file(castep_file_in: TextIO,
                 curr_run["kpt-data"].update(val)
 
         # DEN FMT
-        elif block := Block.from_re(line, castep_file, "BEGIN den_fmt", "END den_fmt"):
+        elif block := LazyBlock.from_re(line, castep_file, "BEGIN den_fmt", "END den_fmt"):
 
             if Filters.TEST_EXTRA_DATA not in to_parse:
+                block.drain()
                 continue
 
             logger("Found DEN fmt")
 
-            block = "\n".join(block[1:-1])  # Strip begin/end tags lazily
-            block = io.StringIO(block)
+            next(block)  # Skip begin tag; end tag is not yielded
             val = parse_den_fmt_file(block)
             if "kpt-data" not in curr_run:
                 curr_run["kpt-data"] = val
@@ -1369,12 +1496,13 @@ def parse_castep_file(castep_file_in: TextIO,
 
 
 def _process_ps_energy(block: Block) -> tuple[str, PSPotEnergy]:
-    if not (match := REs.PS_SHELL_RE.search(next(block))):
+    if not (match := block.initial_match):
         raise ValueError("Invalid PS Energy")
 
     key = match["spec"]
     accum: PSPotEnergy = defaultdict(list)
 
+    next(block)  # Skip opener; already captured in `initial_match`
     next(block)
     accum["pseudo_atomic_energy"] = float(get_numbers(next(block))[1])
     for line in block:
@@ -1394,13 +1522,13 @@ def _process_tddft(block: Block) -> list[TDDFTData]:
          "error": float(match["error"]),
          "type": match["type"]}
         for line in block
-        if (match := REs.TDDFT_RE.match(line))
+        if "+TDDFT" in line and (match := REs.TDDFT_RE.match(line))
     ]
 
 
 def _process_atreg_block(block: Block) -> AtomPropBlock:
     return {
-        atreg_to_index(match): to_type(match.group("x", "y", "z"), float)
+        atreg_to_index(match): tuple(map(float, match.group("x", "y", "z")))
         for line in block
         if (match := REs.ATDAT3VEC.search(line))
     }
@@ -1413,7 +1541,7 @@ def _process_spec_prop(block: Block) -> list[list[str]]:
 
     for line in block:
         words = line.split()
-        if words and re.match(rf"{REs.SPECIES_RE}\b", words[0]):
+        if words and _SPEC_PROP_RE.match(words[0]):
 
             accum.append(words)
 
@@ -1423,9 +1551,7 @@ def _process_spec_prop(block: Block) -> list[list[str]]:
 def _process_md_block(block: Block) -> MDInfo:
     curr_data = {match.group("key").strip(): float(match.group("val"))
                  for line in block
-                 if (match := re.search(r"x\s+"
-                                        r"(?P<key>[a-zA-Z][A-Za-z ]+):\s*"
-                                        rf"(?P<val>{REs.FNUMBER_RE})", line))}
+                 if (match := _MD_DATA_RE.search(line))}
 
     return {normalise_key(key): val for key, val in curr_data.items()}
 
@@ -1433,7 +1559,7 @@ def _process_md_block(block: Block) -> MDInfo:
 def _process_elf(block: Block) -> list[float]:
     return [
         float(match.group(1)) for line in block
-        if (match := re.match(rf"\s+ELF\s+\d+\s+({REs.FNUMBER_RE})", line))
+        if "ELF" in line and (match := _ELF_RE.match(line))
     ]
 
 
@@ -1441,7 +1567,7 @@ def _process_hirshfeld(block: Block) -> dict[AtomIndex, float]:
     """ Process Hirshfeld block to dict of charges """
     return {
         atreg_to_index(match): float(match["charge"]) for line in block
-        if (match := re.match(rf"\s+{REs.ATREG}\s+(?P<charge>{REs.FNUMBER_RE})", line))
+        if (match := _HIRSHFELD_RE.match(line))
     }
 
 
@@ -1453,13 +1579,16 @@ def _process_thermodynamics(block: Block) -> Thermodynamics:
             accum["zero_point_energy"] = float(get_numbers(line)[0])
 
         if match := REs.THERMODYNAMICS_DATA_RE.match(line):
-            stack_dict(accum, match.groupdict())
+            for key, val in match.groupdict().items():
+                accum[key].append(float(val))
 
         # elif re.match(r"\s+T\(", line):  # Can make dict/re based on labels
         #     thermo_label = line.split()
 
-    fix_data_types(accum, {key: float for
-                           key in ("t", "e", "f", "s", "cv")})
+    for key in ("t", "e", "f", "s", "cv"):
+        if key in accum:
+            accum[key] = tuple(accum[key])
+
     return accum
 
 
@@ -1505,18 +1634,19 @@ def _process_params(block: Block) -> dict[str, dict[str, str | tuple[Any, ...]]]
     val: Any
 
     for line in block:
-        if dev_block := Block.from_re(line, block, "Developer Code", gen_table_re("", r"\*+")):
+        if "Developer Code" in line and (dev_block := Block.from_re(line, block, "Developer Code",
+                                                                    gen_table_re("", r"\*+"))):
 
             opt["devel_code"] = _parse_devel_code_block(dev_block)
 
-        elif match := re.match(r"\s*\*+ ([A-Za-z -]+) \*+", line):
+        elif match := _PARAM_GROUP_RE.match(line):
             if curr_opt:
                 opt[curr_group] = curr_opt
 
             curr_group = normalise_string(match.group(1).replace("Parameters", "")).lower()
             curr_opt = {}
 
-        elif match := re.match(r"\s*output (?P<key>.*) unit\s*:\s*(?P<val>.*)", line):
+        elif match := _PARAM_UNIT_RE.match(line):
 
             if "output_units" not in opt:
                 opt["output_units"] = {}
@@ -1613,7 +1743,7 @@ def _process_scf(block: Block) -> list[SCFReport]:
             curr["kinetic_eigenvalue"] = to_type(get_numbers(line)[1], float)
             eig = []
 
-        elif re.match(r"eigenvalue\s*\d+\s*init=", line):
+        elif "init=" in line and _SCF_EIGENVALUE_INIT_RE.match(line):
             numbers = get_numbers(line)
             eig.append({"initial": float(numbers[1]),
                         "final": float(numbers[2]),
@@ -1623,8 +1753,7 @@ def _process_scf(block: Block) -> list[SCFReport]:
             curr["eigenvalue"].append(eig)
             eig = []
 
-        elif match := re.match(r"[+(]?(?P<key>[()0-9A-Za-z -]+)="
-                               rf"\s*{labelled_floats(('val',))} eV\)?", line):
+        elif "eV" in line and (match := _SCF_ENERGY_RE.match(line)):
             key, val = normalise_key(match["key"]), float(match["val"])
             curr[key] = val
 
@@ -1635,12 +1764,13 @@ def _process_scf(block: Block) -> list[SCFReport]:
 
 
 def _process_forces(block: Block) -> tuple[str, AtomPropBlock]:
-    if not (ft_guess := REs.FORCES_BLOCK_RE.search(next(block))):
+    if not (ft_guess := block.initial_match):
         raise ValueError("Invalid forces block")
+    next(block)  # Skip opener; already captured in `initial_match`
     ftype = ft_guess.group(1) if ft_guess.group(1) else "non_descript"
     ftype = normalise_key(ftype)
 
-    accum = {atreg_to_index(match): to_type(match.group("x", "y", "z"), float)
+    accum = {atreg_to_index(match): tuple(map(float, match.group("x", "y", "z")))
              for line in block
              if (match := REs.FORCES_ATDAT.search(line))}
 
@@ -1648,31 +1778,30 @@ def _process_forces(block: Block) -> tuple[str, AtomPropBlock]:
 
 
 def _process_stresses(block: Block) -> tuple[str, SixVector]:
-    if not (ft_guess := REs.STRESSES_BLOCK_RE.search(next(block))):
+    if not (ft_guess := block.initial_match):
         raise ValueError("Invalid stresses block")
+    next(block)  # Skip opener; already captured in `initial_match`
     ftype = ft_guess.group(1) if ft_guess.group(1) else "non_descript"
     ftype = normalise_key(ftype)
 
-    accum = []
+    # Fixed shape: three bordered rows, upper triangle wanted.
+    accum: list[float] = []
     for line in block:
-        numbers = get_numbers(line)
         if "*  x" in line:
-            accum += numbers[0:]
+            accum += map(float, line.split()[-4:-1])
         elif "*  y" in line:
-            accum += numbers[1:]
+            accum += map(float, line.split()[-3:-1])
         elif "*  z" in line:
-            accum += numbers[2:]
+            accum += map(float, line.split()[-2:-1])
 
-    return ftype, to_type(accum, float)
+    return ftype, tuple(accum)
 
 
 def _process_initial_spins(block: Block) -> dict[AtomIndex, InitialSpin]:
     """ Process a set of initial spins into appropriate dict """
     accum: dict[AtomIndex, InitialSpin] = {}
     for line in block:
-        if match := re.match(rf"\s*\|\s*{REs.ATREG}\s*"
-                             rf"{labelled_floats(('spin', 'magmom'))}\s*"
-                             r"(?P<fix>[TF])\s*\|", line):
+        if match := _INITIAL_SPIN_RE.match(line):
             val = match.groupdict()
             ind = atreg_to_index(val)
             fix_data_types(val, {"spin": float, "magmom": float})
@@ -1716,18 +1845,14 @@ def _process_raman(block: Block) -> list[RamanReport]:
             if len(numbers) == 4:
                 curr_mode["depolarisation"] = float(numbers[3])
 
-        elif re.search(r"^ \+\s+\+", line):  # End of 3x3+depol block
+        elif _RAMAN_MODE_END_RE.search(line):  # End of 3x3+depol block
             # Compute Invariants Tr(A) and Tr(A)^2-Tr(A^2) of Raman Tensor
             assert isinstance(curr_mode["tensor"], list)
-            tensor = curr_mode["tensor"]
+            (axx, axy, axz), (ayx, ayy, ayz), (azx, azy, azz) = curr_mode["tensor"]
             curr_mode["tensor"] = cast(ThreeByThreeMatrix, tuple(curr_mode["tensor"]))
-            curr_mode["trace"] = sum(tensor[i][i] for i in range(3))
-            curr_mode["ii"] = (tensor[0][0]*tensor[1][1] +
-                               tensor[0][0]*tensor[2][2] +
-                               tensor[1][1]*tensor[2][2] -
-                               tensor[0][1]*tensor[1][0] -
-                               tensor[0][2]*tensor[2][0] -
-                               tensor[1][2]*tensor[2][1])
+            curr_mode["trace"] = axx + ayy + azz
+            curr_mode["ii"] = (axx*ayy + axx*azz + ayy*azz -
+                               axy*ayx - axz*azx - ayz*azy)
     if curr_mode:
         modes.append(curr_mode)
 
@@ -1743,26 +1868,19 @@ def _process_mulliken(block: Block) -> dict[AtomIndex, MullikenInfo]:
             mull = match.groupdict()
             mull["spin_sep"] = bool(mull["spin_sep"])
             if mull["spin_sep"]:  # We have spin separation
-                add_aliases(mull,
-                            {orb: f"up_{orb}" for orb in (*SHELLS, "total")},
-                            replace=True)
+                add_aliases(mull, _MULL_UP_ALIASES, replace=True)
                 line = next(block)
                 if not (match := REs.POPN_RE_DN.match(line)):
                     raise ValueError("Invalid mulliken down spin")
                 val = match.groupdict()
 
-                add_aliases(val,
-                            {orb: f"dn_{orb}" for orb in (*SHELLS, "total")},
-                            replace=True)
+                add_aliases(val, _MULL_DN_ALIASES, replace=True)
 
                 mull.update(val)
                 mull["total"] = float(mull["up_total"]) + float(mull["dn_total"])
 
             ind = atreg_to_index(mull)
-            fix_data_types(mull, {**{f"{orb}": float for orb in (*SHELLS, "total",
-                                                                 "charge", "spin")},
-                                  **{f"up_{orb}": float for orb in (*SHELLS, "total")},
-                                  **{f"dn_{orb}": float for orb in (*SHELLS, "total")}})
+            fix_data_types(mull, _MULLIKEN_SCHEMA)
             accum[ind] = mull
 
     return accum
@@ -1772,26 +1890,20 @@ def _process_band_structure(block: Block) -> list[BandStructure]:
     """ Process a band structure into a list of kpts"""
 
     def fdt(qdat):
-        fix_data_types(qdat, {"spin": int,
-                              "kx": float,
-                              "ky": float,
-                              "kz": float,
-                              "kpgrp": int,
-                              "band": int,
-                              "energy": float})
+        fix_data_types(qdat, _BS_SCHEMA)
 
     bands = []
     qdata: BandStructure = {}
 
     for line in block:
-        if match := REs.BS_RE.search(line):
+        if "Spin=" in line and (match := REs.BS_RE.search(line)):
             if qdata:
                 fdt(qdata)
                 bands.append(qdata)
 
             qdata = {"band": [], "energy": [], **match.groupdict()}
 
-        elif match := re.search(labelled_floats(("band", "energy"), sep=r"\s+"), line):
+        elif match := _BS_DATA_RE.search(line):
             stack_dict(qdata, match.groupdict())
 
     if qdata:
@@ -1803,16 +1915,14 @@ def _process_band_structure(block: Block) -> list[BandStructure]:
 
 def _process_qdata(qdata: dict[str, str | list[str]]) -> QData:
     """ Special parse for phonon qdata """
+    # Columns absent from the table are all None; a column of zeros is data.
     qdata = {key: val
              for key, val in qdata.items()
-             if any(val) or key == "qpt"}
-    fix_data_types(qdata,
-                   {"qpt": float,
-                    "N": int,
-                    "frequency": float,
-                    "intensity": float,
-                    "raman_intensity": float,
-                    })
+             if key == "qpt" or any(item is not None for item in val)}
+    qdata["qpt"] = to_type(qdata["qpt"], float)
+    for key in _QDATA_TYPES:
+        if key in qdata:
+            qdata[key] = tuple(qdata[key])
     return cast(QData, qdata)
 
 
@@ -1823,15 +1933,20 @@ def _parse_magres_block(task: int, inp: Block) -> dict[str | AtomIndex,
     data: dict[str | AtomIndex, str | dict[str, float | None]] = {}
     data["task"] = REs.MAGRES_TASK[task]
     curr_re = REs.MAGRES_RE[task]
+    # Whether the table has an asymmetry column is a property of the
+    # task's pattern, so decide once rather than per line.
+    has_asym = "asym" in curr_re.groupindex
+
     for line in inp:
         if match := curr_re.match(line):
             tmp = match.groupdict()
             ind = atreg_to_index(tmp)
 
-            val: dict[str, float | None] = {key: float(val)
-                                               for key, val in tmp.items() if key != "asym"}
-            if "asym" in tmp:
-                val["asym"] = float(tmp["asym"]) if tmp["asym"] != "N/A" else None
+            asym = tmp.pop("asym") if has_asym else None
+
+            val: dict[str, float | None] = {key: float(val) for key, val in tmp.items()}
+            if has_asym:
+                val["asym"] = float(asym) if asym != "N/A" else None
 
             data[ind] = val
 
@@ -1854,8 +1969,7 @@ def _process_memory_est(block: Block) -> dict[str, MemoryEst]:
     accum = {}
 
     for line in block:
-        if match := re.match(r"\s*\|([A-Za-z ]+)" +
-                             labelled_floats(("memory", "disk"), suffix=" MB"), line):
+        if match := _MEMORY_EST_RE.match(line):
             key, memory, disk = match.groups()
             accum[normalise_key(key)] = {"memory": float(memory),
                                          "disk": float(disk)}
@@ -1886,12 +2000,10 @@ def _process_kpoint_blocks(block: Block, *,
             elif "Number of kpoints" in line:
                 accum["num_kpoints"] = to_type(get_numbers(line)[0], int)
     else:
-        kp_block_re = re.compile(gen_table_re(r"\d\s*" + labelled_floats(("qx", "qy", "qz", "wt")),
-                                              r"\+"))
         accum: KPointsList = {"points": [{"qpt": to_type(match.group("qx", "qy", "qx"), float),
                                           "weight": to_type(match["wt"], float)}
                                          for line in block
-                                         if (match := kp_block_re.match(line))]}
+                                         if (match := _KP_BLOCK_RE.match(line))]}
         assert isinstance(accum["points"], list)
         accum["num_kpoints"] = len(accum["points"])
 
@@ -1918,7 +2030,7 @@ def _process_symmetry(block: Block) -> tuple[SymmetryReport, ConstraintsReport]:
             else:
                 sym[key] = val
 
-        elif re.match(r"\s*\d+\s*rotation\s*", line):
+        elif _SYM_ROTATION_RE.match(line):
             if "symop" not in sym:
                 sym["symop"] = []
 
@@ -1946,7 +2058,9 @@ def _process_symmetry(block: Block) -> tuple[SymmetryReport, ConstraintsReport]:
         elif "Centre of mass" in line:
             con["com_constrained"] = "NOT" not in line
 
-        elif cons_block := Block.from_re(line, block, r"constraints\.{5}", r"\s*x+\.{4}\s*"):
+        elif "constraints" in line and (cons_block := Block.from_re(line, block,
+                                                                    r"constraints\.{5}",
+                                                                    r"\s*x+\.{4}\s*")):
             con["ionic_constraints"] = defaultdict(list)
             for match in re.finditer(rf"{REs.ATREG}\s*[xyz]\s*" +
                                      labelled_floats(("pos",), counts=(3,)),
@@ -2049,14 +2163,12 @@ def _process_pspot_report(block: Block) -> PSPotReport:
             fix_data_types(val, {"l": int, "j": int,
                                  "e": float, "Rc": float, "norm": int})
             accum["pseudopotential_definition"].append(val)
-        elif match := re.search(rf"Element: (?P<element>{REs.SPECIES_RE})\s+"
-                                rf"Ionic charge: (?P<ionic_charge>{REs.FNUMBER_RE})\s+"
-                                r"Level of theory: (?P<level_of_theory>[\w\d]+)", line):
+        elif match := _PSPOT_ELEMENT_RE.search(line):
             val = match.groupdict()
             val["ionic_charge"] = float(val["ionic_charge"])
             accum.update(val)
 
-        elif match := re.search(r"Atomic Solver:\s*(?P<solver>[\w\s-]+)", line):
+        elif match := _PSPOT_SOLVER_RE.search(line):
             accum["solver"] = normalise_string(match["solver"])
 
         elif match := REs.PSPOT_RE.search(line):
@@ -2095,7 +2207,7 @@ def _process_orbital_populations(block: Block) -> dict[str | AtomIndex, Any]:
             val = match.groupdict()
             ind = atreg_to_index(val)
             accum[ind][val["orb"]] = to_type(val["charge"], float)
-        elif match := re.match(rf"\s*Total:\s*{labelled_floats(('charge',))}", line):
+        elif match := _POPN_TOTAL_RE.match(line):
             accum["total"] = float(match["charge"])
         elif "total projected" in line:
             accum["total_projected"] = to_type(get_numbers(line), float)
@@ -2117,8 +2229,7 @@ def _process_dftd(block: Block) -> dict[str, Any]:
 
             dftd[normalise_key(key)] = val
 
-        elif match := re.match(rf"\s*x\s*(?P<spec>{REs.ATOM_NAME_RE})\s*" +
-                               labelled_floats(("C6", "R0")), line):
+        elif match := _DFTD_SPECIES_RE.match(line):
             dftd["species"][match["spec"]] = {"c6": float(match["C6"]),
                                               "r0": float(match["R0"])}
 
@@ -2166,9 +2277,10 @@ def _process_phonon(block: Block, logger) -> list[QData]:
     accum: list[QData] = []
 
     for line in block:
-        if match := REs.PHONON_RE.match(line):
-            if qdata["qpt"] and qdata["qpt"] not in (phonon["qpt"]
-                                                     for phonon in accum):
+        if "q-pt=" in line and (match := REs.PHONON_RE.match(line)):
+            # Repeated q-points are kept: polar crystals emit the same
+            # q-pt once per q->0 LO/TO direction.
+            if qdata["qpt"]:
                 accum.append(_process_qdata(qdata))
 
             qdata = defaultdict(list)
@@ -2176,20 +2288,23 @@ def _process_phonon(block: Block, logger) -> list[QData]:
 
             logger("Reading qpt %s", qdata["qpt"], level="debug")
 
-        elif match := REs.PROCESS_PHONON_RE.match(line):
+        elif "+" in line and (match := REs.PROCESS_PHONON_RE.match(line)):
             # ==By mode
             # qdata["modes"].append(match.groupdict())
-            # ==By prop
-            stack_dict(qdata, match.groupdict())
-
-        elif char_table := Block.from_re(line, block,
-                                         r"Rep\s+Mul", gen_table_re("[-=]+", r"\+"),
-                                         eof_possible=True):
+            # ==By prop, converted as captured
+            for key, val in match.groupdict().items():
+                typ = _QDATA_TYPES.get(key)
+                qdata[key].append(typ(val) if typ and val is not None else val)
+
+        elif "Rep" in line and (char_table := Block.from_re(
+                line, block,
+                r"Rep\s+Mul", gen_table_re("[-=]+", r"\+"),
+                eof_possible=True)):
             headers = next(char_table).split()[4:]
             next(char_table)
             char: list[CharTable] = []
             for char_line in char_table:
-                if re.search("[-=]{4,}", char_line):
+                if _CHAR_TABLE_END_RE.search(char_line):
                     break
 
                 head, tail = char_line.split("|")
@@ -2208,7 +2323,7 @@ def _process_phonon(block: Block, logger) -> list[QData]:
 
             qdata["char_table"] = char
 
-    if qdata["qpt"] and qdata["qpt"] not in (phonon["qpt"] for phonon in accum):
+    if qdata["qpt"]:
         accum.append(_process_qdata(qdata))
 
     return accum
@@ -2219,7 +2334,7 @@ def _process_dipole(block: Block) -> DipoleTable:
     accum: DipoleTable = {}
 
     for line in block:
-        if match := re.search(r"Total\s*(?P<type>\w+)", line):
+        if match := _DIPOLE_TOTAL_RE.search(line):
             accum[f"total_{match['type']}"] = float(get_numbers(line)[0])
 
         elif "Centre" in line:
@@ -2240,7 +2355,8 @@ def _process_pair_params(block_in: Block) -> dict[str, dict[str, dict | str]]:
     accum: dict[str, Any] = {}
     for line in block_in:
         # Two-body
-        if block := Block.from_re(line, block_in, "Two Body", r"^\w*\s*\*+\s*$"):
+        if "Two Body" in line and (block := Block.from_re(line, block_in,
+                                                          "Two Body", r"^\w*\s*\*+\s*$")):
             for blk_line in block:
                 if REs.PAIR_POT_RES["two_body_spec"].search(blk_line):
                     matches = REs.PAIR_POT_RES["two_body_spec"].finditer(blk_line)
@@ -2263,7 +2379,8 @@ def _process_pair_params(block_in: Block) -> dict[str, dict[str, dict | str]]:
                     labels = ((match["spec"],),)
 
         # Three-body
-        elif block := Block.from_re(line, block_in, "Three Body", r"^\s*\*+\s*$"):
+        elif "Three Body" in line and (block := Block.from_re(line, block_in,
+                                                              "Three Body", r"^\s*\*+\s*$")):
             for blk_line in block:
                 if match := REs.PAIR_POT_RES["three_body_spec"].match(blk_line):
                     labels = (tuple(match["spec"].split()),)
@@ -2323,18 +2440,18 @@ def _process_final_config_block(block_in: Block) -> FinalConfig:
 
     accum: dict[str, Any] = {}
     for line in block_in:
-        if block := Block.from_re(line, block_in, r"\s*Unit Cell\s*", REs.EMPTY, n_end=3):
+        if "Unit Cell" in line and (block := Block.from_re(line, block_in,
+                                                           r"\s*Unit Cell\s*",
+                                                           REs.EMPTY, n_end=3)):
             accum["cell"] = _process_unit_cell(block)
 
-        elif block := Block.from_re(line, block_in,
-                                    gen_table_re("Cell Contents"),
-                                    gen_table_re("", "x+"), n_end=2):
+        elif "Cell Contents" in line and (block := Block.from_re(line, block_in,
+                                                                 gen_table_re("Cell Contents"),
+                                                                 gen_table_re("", "x+"),
+                                                                 n_end=2)):
             accum["atoms"] = _process_atreg_block(block)
 
-        elif match := re.match(rf"^\s*(?:{REs.MINIMISERS_RE}):"
-                               r"(?P<key>[^=]+)=\s*"
-                               f"(?P<value>{REs.EXPFNUMBER_RE}).*",
-                               line, re.IGNORECASE):
+        elif match := _MINIMISER_KEY_VAL_RE.match(line):
 
             key, val = normalise_key(match["key"]), to_type(match["value"], float)
             accum[key] = val
@@ -2355,7 +2472,8 @@ def _process_elastic_properties(block: Block) -> ElasticProperties:
                 val = val[0]
 
             accum[normalise_key(key)] = val
-        elif blk := Block.from_re(line, block, "Speed of Sound", REs.EMPTY):
+        elif "Speed of Sound" in line and (blk := Block.from_re(line, block,
+                                                                "Speed of Sound", REs.EMPTY)):
 
             accum["speed_of_sound"] = cast(ThreeByThreeMatrix,
                                            tuple(to_type(numbers, float)
@@ -2,9 +2,11 @@
 
 import io
 import pprint
-from unittest import TestCase, main
+import re
+from pathlib import Path
+from unittest import TestCase, main, mock
 
-from castep_outputs.parsers import parse_castep_file
+from castep_outputs.parsers import castep_file_parser, parse_castep_file
 from castep_outputs.parsers.castep_file_parser import (Filters,
                                                        _process_pspot_string)
 
@@ -2109,6 +2111,50 @@ WL ********************************************************************
                                                                       0.4453475,
                                                                       1.029811)}]})
 
+    def test_get_vibrational_frequencies_repeated_qpt(self):
+        # Polar crystals repeat the same q-pt once per q->0 LO/TO
+        # direction; both tables must be kept.
+        test_text = io.StringIO("""
+ ==============================================================================
+ +                           Vibrational Frequencies                          +
+ +                           -----------------------                          +
+ +                                                                            +
+ + Performing frequency calculation at  1 wavevector  (q-pt )                 +
+ + ========================================================================== +
+ +                                                                            +
+ + -------------------------------------------------------------------------- +
+ +  q-pt=    1 (  0.000000  0.000000  0.000000)     1.0000000000              +
+ +  q->0 along (  1.000000  0.000000  0.000000)                               +
+ + -------------------------------------------------------------------------- +
+ +  Acoustic sum rule correction <   3.703446 cm-1 applied                    +
+ +     N      Frequency irrep.                                                +
+ +                (cm-1)                                                      +
+ +                                                                            +
+ +     1      -0.026685   a                                                   +
+ +     2     523.060071   b                                                   +
+ + -------------------------------------------------------------------------- +
+ +  q-pt=    1 (  0.000000  0.000000  0.000000)     1.0000000000              +
+ +  q->0 along (  0.000000  0.000000  1.000000)                               +
+ + -------------------------------------------------------------------------- +
+ +  Acoustic sum rule correction <   3.703446 cm-1 applied                    +
+ +     N      Frequency irrep.                                                +
+ +                (cm-1)                                                      +
+ +                                                                            +
+ +     1      -0.026685   a                                                   +
+ +     2     524.104567   b                                                   +
+ ==============================================================================
+        """)
+        test_dict = parse_castep_file(test_text)[0]
+
+        self.assertEqual(test_dict, {'phonons': [{'N': (1, 2),
+                                                  'frequency': (-0.026685, 523.060071),
+                                                  'irrep': ['a', 'b'],
+                                                  'qpt': (0.0, 0.0, 0.0)},
+                                                 {'N': (1, 2),
+                                                  'frequency': (-0.026685, 524.104567),
+                                                  'irrep': ['a', 'b'],
+                                                  'qpt': (0.0, 0.0, 0.0)}]})
+
     def test_phonon_symmetry_verbose(self):
         test_text = io.StringIO("""
   ************************************************************************
@@ -3270,6 +3316,75 @@ Reading continuation data from model file BN.check
 
         self.assertEqual(test_dict, {'continuation': 'BN.check'})
 
+    def test_get_embedded_xrd_sf(self):
+        test_text = io.StringIO("""
+BEGIN xrd_sf
+   h   k   l   Re(F_PAW)   Im(F_PAW)   Re(F_IAM)   Im(F_IAM)
+   1   1   1   42.458193  -42.458196   41.764535  -41.764535
+   2   2   0   67.113321    0.000000   67.563382   -0.000000
+END xrd_sf
+        """)
+
+        test_dict = parse_castep_file(test_text, Filters.TESTING)[0]
+
+        self.assertEqual(test_dict, {'xrd_sf':
+                                     {'qvec': [(1, 1, 1), (2, 2, 0)],
+                                      'f_paw': [42.458193-42.458196j,
+                                                67.113321+0j],
+                                      'f_iam': [41.764535-41.764535j,
+                                                67.563382-0j]}})
+
+    def test_get_embedded_elf_fmt(self):
+        test_text = io.StringIO("""
+BEGIN elf_fmt
+ BEGIN header
+
+           Real Lattice(A)               Lattice parameters(A)    Cell Angles
+   2.8664000   0.0000000   0.0000000     a =    2.866400  alpha =   90.000000
+   0.0000000   2.8664000   0.0000000     b =    2.866400  beta  =   90.000000
+   0.0000000   0.0000000   2.8664000     c =    2.866400  gamma =   90.000000
+
+   1                            ! nspins
+  15    15    15                ! fine FFT grid along <a,b,c>
+ END header: data is "<a b c> chi_alpha chi_beta"
+
+     1     1     1            0.000758            0.003000
+     2     1     1            0.001188            0.004000
+END elf_fmt
+        """)
+
+        test_dict = parse_castep_file(test_text, Filters.TESTING)[0]
+
+        self.assertEqual(test_dict, {'kpt-data':
+                                     {'q': [(1, 1, 1), (2, 1, 1)],
+                                      'chi_alpha': [0.000758, 0.001188],
+                                      'chi_beta': [0.003, 0.004]}})
+
+    def test_embedded_block_filtered(self):
+        # Filtered-out embedded blocks are drained whole; parsing
+        # resumes on the line after the END tag.
+        test_text = io.StringIO("""
+BEGIN xrd_sf
+   h   k   l   Re(F_PAW)   Im(F_PAW)
+   1   1   1   42.458193  -42.458196
+END xrd_sf
+Final energy, E             =  -855.4207241096     eV
+        """)
+
+        test_dict = parse_castep_file(test_text)[0]
+
+        self.assertEqual(test_dict, {'energies': {'final_energy': [-855.4207241096]}})
+
+    def test_embedded_block_unterminated(self):
+        test_text = io.StringIO("""
+BEGIN xrd_sf
+   h   k   l   Re(F_PAW)   Im(F_PAW)
+   1   1   1   42.458193  -42.458196
+""")
+
+        with self.assertRaises(IOError):
+            parse_castep_file(test_text, Filters.TESTING)
+
 
 class test_pspot_parser(TestCase):
     def test_pspot_parser(self):
@@ -3298,5 +3413,41 @@ class test_pspot_parser(TestCase):
             # self.assertEqual(test_dict, {})
 
 
+class test_loop_trigger_prescreen(TestCase):
+    """
+    The main parse loop only dispatches lines containing a _LOOP_TRIGGERS
+    token, so a branch whose opener lacks a listed token is skipped
+    silently.  Re-parse every corpus in this file with the prescreen
+    bypassed and check the output is identical; a new branch added
+    without its trigger token fails here instead of dropping data.
+    """
+
+    @staticmethod
+    def _parse(text, filters):
+        try:
+            return parse_castep_file(io.StringIO(text), filters)
+        except OSError as err:
+            return repr(err)
+
+    def test_prescreen_is_complete(self):
+        source = Path(__file__).read_text(encoding="utf-8")
+        corpora = re.findall(r'io\.StringIO\("""(.*?)"""\)', source, re.DOTALL)
+        corpora.append((Path(__file__).parent / "test.castep").read_text(encoding="utf-8"))
+        self.assertGreater(len(corpora), 50)
+
+        # Matches every line, so the full dispatch chain always runs.
+        no_prescreen = mock.patch.object(castep_file_parser, "_LOOP_TRIGGER_RE",
+                                         re.compile(""))
+
+        for num, text in enumerate(corpora):
+            for filters in (Filters.FULL, Filters.TESTING):
+                with self.subTest(corpus=num, filters=filters.name):
+                    screened = self._parse(text, filters)
+                    with no_prescreen:
+                        unscreened = self._parse(text, filters)
+
+                    self.assertEqual(screened, unscreened)
+
+
 if __name__ == '__main__':
     main()
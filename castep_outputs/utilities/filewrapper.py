@@ -4,16 +4,63 @@ Convenient filewrapper class.
 from __future__ import annotations
 
 import re
+from functools import lru_cache
 from io import StringIO
 from typing import NoReturn, TextIO
 
 from .castep_res import Pattern
 
 
+@lru_cache(maxsize=None)
+def _compile(pattern: str) -> re.Pattern:
+    """
+    Compile `pattern`, caching the result.
+
+    The block delimiters are a small fixed set of strings passed in
+    afresh on every probe; caching the compilation makes repeat probes
+    a dict lookup.
+
+    Parameters
+    ----------
+    pattern : str
+        Pattern to compile.
+
+    Returns
+    -------
+    re.Pattern
+        Compiled pattern.
+    """
+    return re.compile(pattern)
+
+
+def _pattern_search(pattern: Pattern, string: str) -> re.Match | None:
+    """
+    Search `string` for `pattern`, compiling strings through the cache.
+
+    Parameters
+    ----------
+    pattern : Pattern
+        Pattern to search for.
+    string : str
+        String to search.
+
+    Returns
+    -------
+    re.Match | None
+        Resulting match if found.
+    """
+    if isinstance(pattern, str):
+        pattern = _compile(pattern)
+    return pattern.search(string)
+
+
 class FileWrapper:
     """
     Convenience file wrapper to add rewind and line number capabilities.
 
+    The file is read into memory once on construction and then iterated
+    by index, avoiding a ``tell``/``readline`` round-trip per line.
+
     Parameters
     ----------
     file : ~typing.TextIO
@@ -21,6 +68,7 @@ class FileWrapper:
     """
     def __init__(self, file: TextIO):
         self._file = file
+        self._lines = file.readlines()
         self._pos = 0
         self._lineno = 0
 
@@ -28,11 +76,11 @@ class FileWrapper:
         return self
 
     def __next__(self):
-        self._lineno += 1
-        self._pos = self.file.tell()
-        nextline = self.file.readline()
-        if not nextline:
+        if self._lineno >= len(self._lines):
             raise StopIteration
+        self._pos = self._lineno
+        nextline = self._lines[self._lineno]
+        self._lineno += 1
         return nextline
 
     def rewind(self):
@@ -46,10 +94,9 @@ class FileWrapper:
         statement, where we can only check if next line
         does *NOT* match.
         """
-        if self.file.tell() == self._pos:
+        if self._lineno == self._pos:
             return
-        self._lineno -= 1
-        self.file.seek(self._pos)
+        self._lineno = self._pos
 
     @property
     def file(self) -> TextIO:
@@ -96,14 +143,12 @@ class Block:
     """
     # pylint: disable=too-many-arguments
     def __init__(self, parent: TextIO | FileWrapper | Block):
-        if isinstance(parent, (FileWrapper, Block)):
-            self._lineno = parent.lineno
-        else:
-            self._lineno = 0
+        self._lineno = parent.lineno if hasattr(parent, "lineno") else 0
 
         self._name = parent.name if hasattr(parent, "name") else "unknown"
         self._i = -1
         self._data: tuple[str, ...] = ()
+        self._init_match: re.Match | None = None
 
     @classmethod
     def get_lines(
@@ -195,17 +240,19 @@ class Block:
 
         block = cls(in_file)
 
-        if not re.search(start, init_line):
+        if not (match := _pattern_search(start, init_line)):
             # Return empty block. (bool -> False)
             return block
 
+        block._init_match = match
+
         data: list[str] = []
         data.append(init_line)
 
         found = 0
         for line in in_file:
             data.append(line)
-            if re.search(end, line):
+            if _pattern_search(end, line):
                 found += 1
                 if found == n_end:
                     break
@@ -236,6 +283,23 @@ class Block:
         self._data = self._data[fore:
                                 -back if back else None]
 
+    def readline(self) -> str:
+        """
+        Read the next line as a file would.
+
+        Allows passing a block directly to parsers
+        expecting an open file handle.
+
+        Returns
+        -------
+        str
+            Next line, or an empty string once exhausted.
+        """
+        try:
+            return next(self)
+        except StopIteration:
+            return ""
+
     def asstringio(self) -> StringIO:
         """
         Return block as a simulated file.
@@ -293,6 +357,21 @@ class Block:
     def __getitem__(self, key: int | slice):
         return self._data[key]
 
+    @property
+    def initial_match(self) -> re.Match | None:
+        """
+        Match of the `start` pattern against the opening line.
+
+        Saves re-scanning the opener when its groups hold
+        information (e.g. the block type).
+
+        Returns
+        -------
+        re.Match | None
+            Opener match if block came from :meth:`from_re`.
+        """
+        return self._init_match
+
     @property
     def name(self) -> str:
         """
@@ -328,3 +407,157 @@ class Block:
             Block has no internal file holder.
         """
         raise NotImplementedError("Block has no internal file holder.")
+
+
+class LazyBlock:
+    """
+    Lazy counterpart to :class:`Block` for very large regions.
+
+    Yields lines straight from the parent as they are requested rather
+    than materialising the whole region in memory.  The opening line is
+    yielded first; the line matching `end` is consumed but *not*
+    yielded.
+
+    Suitable for regions which are read front-to-back exactly once
+    (e.g. embedded auxiliary files); does not support rewinding or
+    indexing.
+    """
+    def __init__(self, init_line: str,
+                 in_file: TextIO | FileWrapper | Block,
+                 end: Pattern, *,
+                 eof_possible: bool = False):
+        self._parent = in_file
+        self._parent_iter = iter(in_file)
+        self._init_line = init_line
+        self._end = end
+        self._eof_possible = eof_possible
+        self._init_match: re.Match | None = None
+        self._started = False
+        self._done = False
+
+    @classmethod
+    def from_re(
+            cls,
+            init_line: str,
+            in_file: TextIO | FileWrapper | Block,
+            start: Pattern,
+            end: Pattern,
+            *,
+            eof_possible: bool = False,
+    ) -> LazyBlock:
+        """
+        Check if line is the start of a block and return a lazy block if it is.
+
+        Parameters
+        ----------
+        init_line : str
+            Initial line which may start the block.
+        in_file : ~typing.TextIO | FileWrapper | Block
+            File handle to read data from.
+        start : Pattern
+            RegEx matched against `init_line` to see if is start of block.
+        end : Pattern
+            RegEx to verify if block has ended.
+        eof_possible : bool
+            Whether it is possible block is ended by EOF.
+
+        Returns
+        -------
+        LazyBlock
+            Lazy view over the block (empty/falsy if `start` does not match).
+
+        Notes
+        -----
+        Does not advance `in_file` until iterated.
+        """
+        block = cls(init_line, in_file, end, eof_possible=eof_possible)
+        block._init_match = _pattern_search(start, init_line)
+        return block
+
+    def __bool__(self):
+        return self._init_match is not None
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._done or self._init_match is None:
+            raise StopIteration
+
+        if not self._started:
+            self._started = True
+            return self._init_line
+
+        try:
+            line = next(self._parent_iter)
+        except StopIteration:
+            self._done = True
+            if not self._eof_possible:
+                raise OSError(f"Unexpected end of file in {self.name}.") from None
+            raise
+
+        if _pattern_search(self._end, line):
+            self._done = True
+            raise StopIteration
+
+        return line
+
+    def readline(self) -> str:
+        """
+        Read the next line as a file would.
+
+        Returns
+        -------
+        str
+            Next line, or an empty string once exhausted.
+        """
+        try:
+            return next(self)
+        except StopIteration:
+            return ""
+
+    def drain(self):
+        """
+        Consume the remainder of the block without storing it.
+
+        Used when a block is recognised but filtered out, so the
+        parent resumes after the block's end marker.
+        """
+        for _ in self:
+            pass
+
+    @property
+    def initial_match(self) -> re.Match | None:
+        """
+        Match of the `start` pattern against the opening line.
+
+        Returns
+        -------
+        re.Match | None
+            Opener match if the block started.
+        """
+        return self._init_match
+
+    @property
+    def name(self) -> str:
+        """
+        Name of underlying file.
+
+        Returns
+        -------
+        str
+            Name if name is known otherwise "unknown".
+        """
+        return self._parent.name if hasattr(self._parent, "name") else "unknown"
+
+    @property
+    def lineno(self) -> int:
+        """
+        Current line number.
+
+        Returns
+        -------
+        int
+            Current line number in parent file.
+        """
+        return self._parent.lineno if hasattr(self._parent, "lineno") else 0